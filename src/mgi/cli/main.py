@@ -2,25 +2,29 @@ from __future__ import annotations
 import argparse
 from typing import Optional
 
-from rich.console import Console
-from rich.table import Table
+from pathlib import Path
 
 from mgi.config import get_settings
-from mgi.grid.client import GridGraphQLClient
-from mgi.grid.central_data import iter_series_by_tournament, get_titles
+from mgi.logging_conf import setup_logging
 
-from pathlib import Path
-from mgi.grid.file_download import GridFileDownloadClient
+# rich, the GRID clients and the analysis module are imported inside the commands that
+# use them, so `--help` and unrelated subcommands don't pay for their import time.
 
-from mgi.features import mistakes_untraded
 
-from mgi.logging_conf import setup_logging
+def cmd_titles() -> int:
+    from rich.console import Console
+    from rich.table import Table
 
+    from mgi.grid.central_data import get_titles
+    from mgi.grid.client import GridGraphQLClient
 
-def cmd_titles() -> int:
     settings = get_settings()
-    client = GridGraphQLClient(base_url=settings.grid_central_data_url, api_key=settings.grid_api_key)
-    titles = get_titles(client)
+    with GridGraphQLClient(
+        base_url=settings.grid_central_data_url,
+        api_key=settings.grid_api_key,
+        persisted_queries=settings.grid_persisted_queries,
+    ) as client:
+        titles = get_titles(client)
 
     console = Console()
     table = Table(title="Available Titles")
@@ -35,10 +39,19 @@ def cmd_titles() -> int:
 
 
 def cmd_series_list(tournament_id: str, team: Optional[str], limit: int) -> int:
-    settings = get_settings()
-    client = GridGraphQLClient(base_url=settings.grid_central_data_url, api_key=settings.grid_api_key)
+    from rich.console import Console
+    from rich.table import Table
+
+    from mgi.grid.central_data import iter_series_by_tournament
+    from mgi.grid.client import GridGraphQLClient
 
-    series_list = iter_series_by_tournament(client, tournament_id=tournament_id, team_filter=team)
+    settings = get_settings()
+    with GridGraphQLClient(
+        base_url=settings.grid_central_data_url,
+        api_key=settings.grid_api_key,
+        persisted_queries=settings.grid_persisted_queries,
+    ) as client:
+        series_list = iter_series_by_tournament(client, tournament_id=tournament_id, team_filter=team)
 
     if not series_list:
         print("No series found for given filters.")
@@ -70,54 +83,67 @@ def cmd_series_list(tournament_id: str, team: Optional[str], limit: int) -> int:
     return 0
 
 def cmd_series_fetch(series_id: str) -> int:
+    from mgi.common import jsonio
+    from mgi.grid.file_download import GridFileDownloadClient
+
     settings = get_settings()
 
-    client = GridFileDownloadClient(
+    with GridFileDownloadClient(
         base_url=settings.grid_file_base_url,
         api_key=settings.grid_api_key,
-    )
-
-    listing = client.list_files(series_id)
-    files = listing.get("files", [])
-
-    if not files:
-        print("No downloadable files found for this series.")
-        print(listing)
-        return 1
-
-    # Find urls
-    events = next((f for f in files if f.get("id") == "events-grid"), None)
-    state = next((f for f in files if f.get("id") == "state-grid"), None)
-
-    out_dir = Path("data") / "raw" / f"series_{series_id}"
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    # Save listing for audit/debug
-    GridFileDownloadClient.pretty_save_json(listing, out_dir / "file_list.json")
-
-    if state and state.get("fullURL"):
-        print(f"Downloading end state: {state.get('fileName')}")
-        # end-state is JSON, save pretty
-        state_obj = client.session.get(state["fullURL"], timeout=120).json()
-        GridFileDownloadClient.pretty_save_json(state_obj, out_dir / "end_state.json")
-    else:
-        print("state-grid not available or missing fullURL.")
-
-    if events and events.get("fullURL"):
-        print(f"Downloading events: {events.get('fileName')}")
-        zip_path = out_dir / "events.jsonl.zip"
-        client.download_to(events["fullURL"], zip_path)
-        jsonl_path = out_dir / "events.jsonl"
-        client.unzip_first_jsonl(zip_path, jsonl_path)
-        print(f"Extracted: {jsonl_path}")
-    else:
-        print("events-grid not available or missing fullURL.")
+        listing_cache_dir=Path("data") / "cache" / "file_list",
+    ) as client:
+        listing = client.list_files(series_id)
+        files = listing.get("files", [])
+
+        if not files:
+            print("No downloadable files found for this series.")
+            print(listing)
+            return 1
+
+        # Find urls
+        events = next((f for f in files if f.get("id") == "events-grid"), None)
+        state = next((f for f in files if f.get("id") == "state-grid"), None)
+
+        out_dir = Path("data") / "raw" / f"series_{series_id}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save listing for audit/debug
+        GridFileDownloadClient.pretty_save_json(listing, out_dir / "file_list.json")
+
+        if state and state.get("fullURL"):
+            print(f"Downloading end state: {state.get('fileName')}")
+            # end-state is JSON, save pretty
+            r = client.session.get(state["fullURL"], timeout=120)
+            state_obj = jsonio.loads(r.content)
+            GridFileDownloadClient.pretty_save_json(state_obj, out_dir / "end_state.json")
+        else:
+            print("state-grid not available or missing fullURL.")
+
+        if events and events.get("fullURL"):
+            print(f"Downloading events: {events.get('fileName')}")
+            zip_path = out_dir / "events.jsonl.zip"
+            client.download_to(events["fullURL"], zip_path)
+            jsonl_path = out_dir / "events.jsonl"
+            client.unzip_first_jsonl(zip_path, jsonl_path)
+            print(f"Extracted: {jsonl_path}")
+        else:
+            print("events-grid not available or missing fullURL.")
 
     print(f"Saved files under: {out_dir}")
     return 0
 
-def cmd_mistakes_untraded(series_id: str, top: int, window_seconds: int) -> int:
-    return mistakes_untraded.run(series_id=series_id, top=top, window_seconds=window_seconds)
+def cmd_mistakes_untraded(series_ids: list[str], top: int, window_seconds: int, workers: Optional[int]) -> int:
+    from mgi.features import mistakes_untraded
+
+    if len(series_ids) == 1:
+        return mistakes_untraded.run(series_id=series_ids[0], top=top, window_seconds=window_seconds)
+
+    codes = mistakes_untraded.run_many(series_ids, top=top, window_seconds=window_seconds, workers=workers)
+    for series_id, code in codes.items():
+        status = f"data/derived/series_{series_id}/mistakes_untraded.json" if code == 0 else "failed"
+        print(f"series {series_id}: {status}")
+    return max(codes.values(), default=0)
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="mgi", description="Mistake Gravity Index CLI")
@@ -143,10 +169,11 @@ def build_parser() -> argparse.ArgumentParser:
     mistakes_sub = p_mistakes.add_subparsers(dest="mistakes_cmd", required=True)
 
     p_untraded = mistakes_sub.add_parser("untraded", help="Extract untraded deaths from events.jsonl")
-    p_untraded.add_argument("--series-id", required=True, help="Series ID")
+    p_untraded.add_argument("--series-id", required=True, nargs="+", help="Series ID (several run in parallel, without the report)")
     p_untraded.add_argument("--top", type=int, default=10, help="Rows to print (default 10)")
     p_untraded.add_argument("--window-seconds", type=int, default=10, help="Trade window in seconds (default 10)")
-    p_untraded.set_defaults(func=lambda args: cmd_mistakes_untraded(args.series_id, args.top, args.window_seconds))
+    p_untraded.add_argument("--workers", type=int, default=None, help="Worker processes for several series (default: CPU count)")
+    p_untraded.set_defaults(func=lambda args: cmd_mistakes_untraded(args.series_id, args.top, args.window_seconds, args.workers))
 
     return p
 
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install mistake-gravity-index[fast]
+    orjson = None
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _make_default() -> Callable[[Any], Any]:
+    # Objective timestamps repeat across many rows, so memoize isoformat() for one dump
+    iso_cache: dict[datetime, str] = {}
+
+    def default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            iso = iso_cache.get(obj)
+            if iso is None:
+                iso = iso_cache[obj] = obj.isoformat()
+            return iso
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    return default
+
+
+def write_pretty(path: Path, obj: Any) -> None:
+    """
+    Writes `obj` to `path` as 2-space indented UTF-8 JSON, using orjson when it is installed.
+    datetimes are written as isoformat() strings on both paths. The stdlib fallback streams
+    into a 1 MiB-buffered file instead of building the whole document as one str.
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with path.open("w", encoding="utf-8", buffering=1024 * 1024) as f:
+        json.dump(obj, f, indent=2, default=_make_default())
+
+
+def iter_jsonl_lines(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yields (line_no, line_bytes) for each non-blank line of a JSONL file.
+    The file is memory-mapped and split on LF directly, so no text decoding happens here.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            start = 0
+            line_no = 0
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                line_no += 1
+                line = mm[start:end]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                # JSON parsers skip surrounding whitespace themselves; only blank lines need filtering
+                if line and not line.isspace():
+                    yield line_no, line
+                start = end + 1
+
+
+def jsonl_line_count(path: Path) -> int:
+    """
+    Number of lines in a JSONL file (a final line without LF counts too).
+    Counts LF bytes in 1 MiB blocks with bytes.count, so no per-line Python work happens.
+    """
+    count = 0
+    last = b"\n"
+    with path.open("rb") as f:
+        while block := f.read(1024 * 1024):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count if last == b"\n" else count + 1
@@ -1,9 +1,51 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+
+_UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+_ONE_US = timedelta(microseconds=1)
+
+# Parsed timestamps keyed by the raw string; cleared wholesale when it reaches the bound
+_DT_CACHE: dict[str, datetime] = {}
+_DT_CACHE_MAX = 100_000
+
 
 def parse_dt(s: str) -> datetime:
-    """Parse GRID timestamps like '2024-06-15T22:45:00.000Z' to UTC datetime."""
+    """Parse GRID timestamps like '2024-06-15T22:45:00.000Z' to UTC datetime.
+
+    Memoized: envelopes and their cross-references repeat the same strings.
+    """
+    dt = _DT_CACHE.get(s)
+    if dt is None:
+        if len(_DT_CACHE) >= _DT_CACHE_MAX:
+            _DT_CACHE.clear()
+        dt = _DT_CACHE[s] = _parse_dt_uncached(s)
+    return dt
+
+
+def _parse_dt_uncached(s: str) -> datetime:
+    # Fast path for GRID's 'YYYY-MM-DDTHH:MM:SS[.f{1,6}]Z' shape: no ISO parsing, no tz conversion
+    n = len(s)
+    if 20 <= n <= 27 and s[-1] == "Z" and s[10] == "T" and s[4] == "-":
+        frac = s[20:-1]
+        if n == 20 or (s[19] == "." and frac.isdigit()):
+            return datetime(
+                int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                int(s[11:13]), int(s[14:16]), int(s[17:19]), int(frac.ljust(6, "0")) if frac else 0,
+                _UTC,
+            )
     if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
-    return datetime.fromisoformat(s).astimezone(timezone.utc)
+        # Already UTC: attach the shared tzinfo instead of converting
+        return datetime.fromisoformat(s[:-1]).replace(tzinfo=_UTC)
+    return datetime.fromisoformat(s).astimezone(_UTC)
+
+
+def to_epoch_ns(dt: datetime) -> int:
+    """Exact integer nanoseconds since the Unix epoch for an aware datetime."""
+    return (dt - _EPOCH) // _ONE_US * 1000
+
+
+def from_epoch_ns(ns: int) -> datetime:
+    """Inverse of to_epoch_ns (exact to the microsecond)."""
+    return _EPOCH + timedelta(microseconds=ns // 1000)
@@ -1,27 +1,38 @@
 from dataclasses import dataclass
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
 
 @dataclass(frozen=True)
 class Settings:
     grid_api_key: str
     grid_central_data_url: str
     grid_file_base_url: str
+    grid_persisted_queries: bool = False
+
 
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Read .env once, on first use rather than as a side effect of importing this module."""
+    load_dotenv()
 
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
+    load_env()
+
     api_key = os.getenv("GRID_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("GRID_API_KEY is not set. Put it in your .env file.")
 
     central_url = os.getenv("GRID_CENTRAL_DATA_URL", "https://api-op.grid.gg/central-data/graphql").strip()
     file_base   = os.getenv("GRID_FILE_BASE_URL", "https://api.grid.gg").strip()
+    persisted   = os.getenv("GRID_PERSISTED_QUERIES", "").strip().lower() in ("1", "true", "yes")
 
     return Settings(
         grid_api_key=api_key,
         grid_central_data_url=central_url,
         grid_file_base_url=file_base,
-    )
\ No newline at end of file
+        grid_persisted_queries=persisted,
+    )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # optional speedup: pip install mistake-gravity-index[jit]
+    njit = None
+
+
+def _untraded_mask_py(t_ns: np.ndarray, killer_codes: np.ndarray, victim_codes: np.ndarray, gap_ns: int) -> np.ndarray:
+    n = len(t_ns)
+    if n == 0:
+        return np.zeros(0, dtype=np.bool_)
+
+    # cluster[i]: fight cluster id of kill i (a new cluster starts after every gap > gap_ns)
+    cluster = np.zeros(n, dtype=np.intp)
+    np.cumsum(np.diff(t_ns) > gap_ns, out=cluster[1:])
+
+    # last_kill[team, cluster]: index of the team's last kill in that cluster, -1 if none
+    n_teams = int(max(killer_codes.max(), victim_codes.max())) + 1
+    last_kill = np.full((n_teams, int(cluster[-1]) + 1), -1, dtype=np.intp)
+    idx = np.arange(n)
+    np.maximum.at(last_kill, (killer_codes, cluster), idx)
+
+    return last_kill[victim_codes, cluster] <= idx
+
+
+def _untraded_mask_loop(t_ns, killer_codes, victim_codes, gap_ns):  # pragma: no cover - compiled by numba
+    n = t_ns.shape[0]
+    untraded = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return untraded
+
+    n_teams = max(killer_codes.max(), victim_codes.max()) + 1
+    teams_killing_later = np.zeros(n_teams, dtype=np.bool_)
+    for i in range(n - 1, -1, -1):
+        if i == n - 1 or t_ns[i + 1] - t_ns[i] > gap_ns:
+            teams_killing_later[:] = False
+        untraded[i] = not teams_killing_later[victim_codes[i]]
+        teams_killing_later[killer_codes[i]] = True
+
+    return untraded
+
+
+# Explicit signature: compiled once (and cached on disk) for the only dtypes detect_untraded passes
+_UNTRADED_MASK_SIGNATURE = "boolean[:](int64[:], int32[:], int32[:], int64)"
+_untraded_mask_jit = njit(_UNTRADED_MASK_SIGNATURE, cache=True)(_untraded_mask_loop) if njit is not None else None
+
+
+def untraded_mask(t_ns: np.ndarray, killer_codes: np.ndarray, victim_codes: np.ndarray, gap_ns: int) -> np.ndarray:
+    """
+    Boolean mask over time-sorted kills: True where the victim team makes no later kill
+    in the same fight cluster (consecutive kills at most gap_ns apart).
+
+    The numba kernel is one backward pass: the set of teams that kill later in the current
+    cluster is cleared at every cluster boundary. Without numba, the same rule is evaluated with
+    NumPy over a (team, cluster) table of last kill indices.
+
+    Team codes must be small non-negative ints.
+    """
+    # Any integer dtype (or list) is accepted; the compiled kernel only takes int64 times and
+    # int32 codes. A no-op for the arrays Kills already holds.
+    t_ns = np.asarray(t_ns, dtype=np.int64)
+    killer_codes = np.asarray(killer_codes, dtype=np.int32)
+    victim_codes = np.asarray(victim_codes, dtype=np.int32)
+    if _untraded_mask_jit is not None:
+        return _untraded_mask_jit(t_ns, killer_codes, victim_codes, gap_ns)
+    return _untraded_mask_py(t_ns, killer_codes, victim_codes, gap_ns)
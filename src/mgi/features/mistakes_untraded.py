@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-import json
-from collections import Counter, defaultdict
+import heapq
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from rich.console import Console
 from rich.table import Table
-
-from mgi.common.time import parse_dt
-from mgi.features.objectives import iter_objectives_from_events_jsonl, objective_answered_after
+from rich.text import Text
+
+from mgi.common import jsonio
+from mgi.common.time import from_epoch_ns, parse_dt, to_epoch_ns
+from mgi.features._numba_kernels import untraded_mask
+from mgi.features.objectives import (
+    _EMPTY,
+    ObjectiveEvent,
+    has_objective_marker,
+    objective_answered_after,
+    objective_from_event,
+)
 
 # ---- Defaults (MVP) ----
 DEFAULT_FIGHT_GAP_SECONDS = 45
@@ -27,6 +39,10 @@ GRAVITY_LATE = 35
 GRAVITY_MID_MINUTES = 15
 GRAVITY_LATE_MINUTES = 25
 
+# Bucket table for the above: elapsed-time cut-offs (epoch-ns deltas) and the gravity of each bucket
+GRAVITY_THRESHOLDS_NS = np.array([GRAVITY_MID_MINUTES, GRAVITY_LATE_MINUTES], dtype=np.int64) * 60_000_000_000
+GRAVITY_LEVELS = np.array([GRAVITY_BASE, GRAVITY_MID, GRAVITY_LATE], dtype=np.int32)
+
 OBJ_KIND_WEIGHT = {
     "baron": 8,
     "atakhan": 8,
@@ -64,22 +80,48 @@ def score_mgi(
     return score
 
 
-@dataclass
-class Kill:
-    occurred_at: datetime
-    killer_player_id: str
-    killer_name: str
-    killer_team_id: str
-    victim_player_id: str
-    victim_name: str
-    victim_team_id: str
+def score_mgi_array(
+    gravity: np.ndarray,
+    answered_by_objective: np.ndarray,
+    is_pressure: np.ndarray,
+    is_context: np.ndarray,
+    nearest_kind_weight: np.ndarray,
+) -> np.ndarray:
+    """
+    score_mgi over whole columns at once. `nearest_kind_weight` holds the OBJ_KIND_WEIGHT
+    of each row's nearest objective (0 when there is none).
+    """
+    return (
+        gravity.astype(np.int64)
+        + np.where(answered_by_objective, 0, 10)
+        + np.where(is_pressure, 8, np.where(is_context, 3, 0))
+        + nearest_kind_weight
+    )
 
 
 @dataclass
+class Kills:
+    """Kill events as parallel columns (structure-of-arrays), in file order."""
+    occurred_at_ns: np.ndarray      # int64 epoch-ns
+    killer_player_ids: List[str]
+    killer_names: List[str]
+    killer_team_codes: np.ndarray   # int32, indexes team_ids
+    victim_player_ids: List[str]
+    victim_names: List[str]
+    victim_team_codes: np.ndarray   # int32, indexes team_ids
+    team_ids: List[str]
+
+    def __len__(self) -> int:
+        return len(self.occurred_at_ns)
+
+
+@dataclass(slots=True)
 class Mistake:
     occurred_at: datetime
+    occurred_at_ns: int
     victim_name: str
     victim_team_id: str
+    victim_team_code: int
     kind: str
     gravity: int
     details: str
@@ -91,80 +133,141 @@ def load_team_names(end_state_path: Path) -> dict[str, str]:
     if not end_state_path.exists():
         return {}
 
-    obj = json.loads(end_state_path.read_text(encoding="utf-8"))
-
-    ss = obj.get("seriesState", {}) if isinstance(obj, dict) else {}
-    teams = ss.get("teams", []) if isinstance(ss, dict) else []
+    obj = jsonio.loads(end_state_path.read_bytes())
 
     out: dict[str, str] = {}
-    if isinstance(teams, list):
-        for t in teams:
-            if not isinstance(t, dict):
-                continue
-            tid = str(t.get("id", "")).strip()  # convert int -> str
-            name = str(t.get("name", "")).strip()
+    try:
+        for t in obj["seriesState"]["teams"]:
+            tid = t.get("id", "")
+            tid = tid.strip() if isinstance(tid, str) else str(tid).strip()  # convert int -> str
+            name = t.get("name", "")
+            name = name.strip() if isinstance(name, str) else str(name).strip()
             if tid and name:
                 out[tid] = name
+    except (KeyError, TypeError, AttributeError):
+        pass  # not a GRID end state (or truncated): keep whatever names were read
 
     return out
 
 
-def iter_kills_from_events_jsonl(path: Path) -> Iterable[Kill]:
-    with path.open("r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
+KILL_EVENT_MARKER = b'"player-killed-player"'
 
+
+def load_events_jsonl(path: Path) -> Tuple[Kills, List[ObjectiveEvent]]:
+    """
+    Reads kills and objective events from events.jsonl in a single pass,
+    so each envelope is read and JSON-decoded once.
+    Objectives are returned in file order.
+    """
+    objectives: List[ObjectiveEvent] = []
+    occurred_at_ns: List[int] = []
+    killer_player_ids: List[str] = []
+    killer_names: List[str] = []
+    killer_teams: List[int] = []
+    victim_player_ids: List[str] = []
+    victim_names: List[str] = []
+    victim_teams: List[int] = []
+    team_codes: dict[str, int] = {}
+    intern = sys.intern
+
+    for line_no, line in jsonio.iter_jsonl_lines(path):
+        # Most envelopes carry neither kills nor objectives; a C-level substring test is far cheaper
+        # than parsing them. False positives (a marker inside some string) fall through the type checks below.
+        has_kills = KILL_EVENT_MARKER in line
+        has_objectives = has_objective_marker(line)
+        if not (has_kills or has_objectives):
+            continue
+
+        try:
+            envelope: Dict[str, Any] = jsonio.loads(line)
+            envelope_at = parse_dt(envelope["occurredAt"])
+        except Exception as e:
+            if has_kills:
+                print(f"[WARN] Skipping malformed JSONL line {line_no}: {e}")
+            continue
+
+        events = envelope.get("events", [])
+        if not isinstance(events, list):
+            continue
+
+        envelope_ns = to_epoch_ns(envelope_at)
+        for ev in events:
             try:
-                envelope: Dict[str, Any] = json.loads(line)
-                occurred_at = parse_dt(envelope["occurredAt"])
+                if ev.get("type") != "player-killed-player":
+                    if has_objectives:
+                        obj = objective_from_event(ev, envelope_at, envelope_ns)
+                        if obj is not None:
+                            objectives.append(obj)
+                    continue
+
+                actor = ev.get("actor") or _EMPTY
+                target = ev.get("target") or _EMPTY
+
+                a_state = actor.get("state") or _EMPTY
+                t_state = target.get("state") or _EMPTY
+
+                # ~10 players and 2 teams repeat across thousands of kills: share one str object each
+                killer_player_id = intern(str(actor.get("id", "")))
+                killer_name = intern(str(a_state.get("name", "")))
+                killer_team_id = intern(str(a_state.get("teamId", "")))
+
+                victim_player_id = intern(str(target.get("id", "")))
+                victim_name = intern(str(t_state.get("name", "")))
+                victim_team_id = intern(str(t_state.get("teamId", "")))
+
+                if not (killer_player_id and victim_player_id):
+                    continue
+
+                occurred_at_ns.append(envelope_ns)
+                killer_player_ids.append(killer_player_id)
+                killer_names.append(killer_name)
+                killer_teams.append(team_codes.setdefault(killer_team_id, len(team_codes)))
+                victim_player_ids.append(victim_player_id)
+                victim_names.append(victim_name)
+                victim_teams.append(team_codes.setdefault(victim_team_id, len(team_codes)))
             except Exception as e:
-                print(f"[WARN] Skipping malformed JSONL line {line_no}: {e}")
+                print(f"[WARN] Bad event at line {line_no}: {e}")
                 continue
 
-            events = envelope.get("events", [])
-            if not isinstance(events, list):
-                continue
+    kills = Kills(
+        occurred_at_ns=np.asarray(occurred_at_ns, dtype=np.int64),
+        killer_player_ids=killer_player_ids,
+        killer_names=killer_names,
+        killer_team_codes=np.asarray(killer_teams, dtype=np.int32),
+        victim_player_ids=victim_player_ids,
+        victim_names=victim_names,
+        victim_team_codes=np.asarray(victim_teams, dtype=np.int32),
+        team_ids=list(team_codes),
+    )
+    return kills, objectives
 
-            for ev in events:
-                try:
-                    if ev.get("type") != "player-killed-player":
-                        continue
-
-                    actor = ev.get("actor", {}) or {}
-                    target = ev.get("target", {}) or {}
-
-                    a_state = actor.get("state", {}) or {}
-                    t_state = target.get("state", {}) or {}
-
-                    killer_player_id = str(actor.get("id", ""))
-                    killer_name = str(a_state.get("name", ""))
-                    killer_team_id = str(a_state.get("teamId", ""))
-
-                    victim_player_id = str(target.get("id", ""))
-                    victim_name = str(t_state.get("name", ""))
-                    victim_team_id = str(t_state.get("teamId", ""))
-
-                    if not (killer_player_id and victim_player_id):
-                        continue
-
-                    yield Kill(
-                        occurred_at=occurred_at,
-                        killer_player_id=killer_player_id,
-                        killer_name=killer_name,
-                        killer_team_id=killer_team_id,
-                        victim_player_id=victim_player_id,
-                        victim_name=victim_name,
-                        victim_team_id=victim_team_id,
-                    )
-                except Exception as e:
-                    print(f"[WARN] Bad kill event at line {line_no}: {e}")
-                    continue
+
+def detect_untraded(kills: Kills, fight_gap_seconds: int = DEFAULT_FIGHT_GAP_SECONDS) -> np.ndarray:
+    """
+    Returns indices into `kills` of untraded deaths, in time order.
+    Works on the int columns only; no per-kill Python objects are created.
+    """
+    t = kills.occurred_at_ns
+    killer_codes = kills.killer_team_codes
+    victim_codes = kills.victim_team_codes
+
+    # GRID logs are almost always time-ordered already; only permute when they aren't.
+    # The stable argsort matches sorting the records by occurred_at.
+    order: Optional[np.ndarray] = None
+    if not (np.diff(t) >= 0).all():
+        order = np.argsort(t, kind="stable")
+        t = t[order]
+        killer_codes = killer_codes[order]
+        victim_codes = victim_codes[order]
+
+    # Single reverse sweep over the int arrays (numba-compiled when available):
+    # a death is traded iff the victim team kills again later in the same fight cluster.
+    untraded = np.flatnonzero(untraded_mask(t, killer_codes, victim_codes, fight_gap_seconds * 1_000_000_000))
+    return untraded if order is None else order[untraded]
 
 
 def extract_untraded_deaths_clustered(
-    kills: List[Kill],
+    kills: Kills,
     fight_gap_seconds: int = DEFAULT_FIGHT_GAP_SECONDS,
 ) -> List[Mistake]:
     """
@@ -174,75 +277,108 @@ def extract_untraded_deaths_clustered(
 
     Fight cluster = consecutive kills where the time gap between kills <= fight_gap_seconds.
     """
-    kills = sorted(kills, key=lambda k: k.occurred_at)
     out: List[Mistake] = []
-    if not kills:
-        return out
-
-    # Assign fight clusters based on time gap
-    cluster_id = 0
-    kill_cluster: List[int] = [0] * len(kills)
-    for i in range(1, len(kills)):
-        gap = (kills[i].occurred_at - kills[i - 1].occurred_at).total_seconds()
-        if gap > fight_gap_seconds:
-            cluster_id += 1
-        kill_cluster[i] = cluster_id
-
-    # For each cluster, store kill indices by killer team
-    cluster_team_kill_indices: dict[int, dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
-    for idx, k in enumerate(kills):
-        cid = kill_cluster[idx]
-        cluster_team_kill_indices[cid][k.killer_team_id].append(idx)
-
-    # Mark death untraded if victim team has no kill AFTER this death inside same cluster
-    for idx, k in enumerate(kills):
-        cid = kill_cluster[idx]
-        victim_team = k.victim_team_id
-
-        victim_kill_indices = cluster_team_kill_indices[cid].get(victim_team, [])
-        traded_after = any(j > idx for j in victim_kill_indices)
-
-        if not traded_after:
-            out.append(
-                Mistake(
-                    occurred_at=k.occurred_at,
-                    victim_name=k.victim_name or k.victim_player_id,
-                    victim_team_id=victim_team,
-                    kind="untraded_death",
-                    gravity=GRAVITY_BASE,
-                    details=(
-                        f"Died to {k.killer_name or k.killer_player_id} with no kill by victim team "
-                        f"after death in same fight cluster (gap={fight_gap_seconds}s)"
-                    ),
-                )
+    for i in detect_untraded(kills, fight_gap_seconds).tolist():
+        ns = int(kills.occurred_at_ns[i])
+        victim_code = int(kills.victim_team_codes[i])
+        killer_label = kills.killer_names[i] or kills.killer_player_ids[i]
+        out.append(
+            Mistake(
+                occurred_at=from_epoch_ns(ns),
+                occurred_at_ns=ns,
+                victim_name=kills.victim_names[i] or kills.victim_player_ids[i],
+                victim_team_id=kills.team_ids[victim_code],
+                victim_team_code=victim_code,
+                kind="untraded_death",
+                gravity=GRAVITY_BASE,
+                details=(
+                    f"Died to {killer_label} with no kill by victim team "
+                    f"after death in same fight cluster (gap={fight_gap_seconds}s)"
+                ),
             )
+        )
 
     return out
 
 
+def _most_common_codes(codes: np.ndarray, minlength: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Returns the codes present in `codes`, ordered like Counter.most_common():
+    by count (or summed `weights`) descending, ties broken by first appearance.
+    """
+    counts = np.bincount(codes, minlength=minlength)
+    totals = counts if weights is None else np.bincount(codes, weights=weights, minlength=minlength)
+    first_seen = np.full(minlength, len(codes), dtype=np.int64)
+    np.minimum.at(first_seen, codes, np.arange(len(codes)))
+    order = np.lexsort((first_seen, -totals))
+    return order[counts[order] > 0]
+
+
 def nearest_objective_window(
     objectives: Sequence[Any],
-    when: datetime,
+    when: datetime | int,
     window_seconds: int,
+    objectives_ns: Optional[Sequence[int]] = None,
 ) -> Optional[Tuple[Any, int]]:
     """
     Returns (objective_event, delta_seconds) for the closest objective within ±window.
     delta_seconds = objective_time - when (negative means objective happened before the death).
-    """
-    best: Optional[Tuple[Any, int]] = None
-    best_abs: Optional[float] = None
+    `when` is a datetime or, to skip the conversion, epoch-ns.
 
-    for obj in objectives:
-        delta = (obj.occurred_at - when).total_seconds()
-        if abs(delta) <= window_seconds:
-            if best_abs is None or abs(delta) < best_abs:
-                best = (obj, int(delta))
-                best_abs = abs(delta)
+    If `objectives` is sorted by time, pass their epoch-ns keys as `objectives_ns`: only the
+    two neighbours of the bisection point are then examined. Otherwise every objective is
+    scanned. Either way, on equal distance the one listed first wins.
+    """
+    when_ns = to_epoch_ns(when) if isinstance(when, datetime) else when
+    window_ns = window_seconds * 1_000_000_000
+
+    if objectives_ns is None:
+        best_obj: Optional[Tuple[Any, int]] = None
+        best_abs: Optional[int] = None
+        for obj in objectives:
+            delta_ns = obj.occurred_at_ns - when_ns
+            if abs(delta_ns) <= window_ns and (best_abs is None or abs(delta_ns) < best_abs):
+                best_obj = (obj, int(delta_ns / 1_000_000_000))
+                best_abs = abs(delta_ns)
+        return best_obj
+
+    i = bisect_left(objectives_ns, when_ns)
+    best: Optional[int] = None
+    if i > 0:
+        # first objective of the latest timestamp before `when`
+        best = bisect_left(objectives_ns, objectives_ns[i - 1], 0, i)
+    if i < len(objectives_ns) and (best is None or objectives_ns[i] - when_ns < when_ns - objectives_ns[best]):
+        best = i
+
+    if best is None:
+        return None
+    delta_ns = objectives_ns[best] - when_ns
+    if abs(delta_ns) > window_ns:
+        return None
+    return objectives[best], int(delta_ns / 1_000_000_000)
+
+
+def _print_table(console: Console, table: Table) -> None:
+    """
+    Renders `table` with Rich on a terminal. When output is redirected, writes it as
+    plain TSV instead (title line, header row, one line per row, markup stripped),
+    which skips Rich's layout work and is easier to post-process.
+    """
+    if console.is_terminal:
+        console.print(table)
+        return
 
-    return best
+    lines = [str(table.title or ""), "\t".join(str(c.header) for c in table.columns)]
+    for row in zip(*(c.cells for c in table.columns)):
+        lines.append("\t".join(Text.from_markup(cell).plain if isinstance(cell, str) else str(cell) for cell in row))
+    console.file.write("\n".join(lines) + "\n")
 
 
-def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> int:
+def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECONDS, quiet: bool = False) -> int:
+    """
+    Extracts untraded deaths for one downloaded series and writes
+    data/derived/series_<id>/mistakes_untraded.json. Unless `quiet`, prints the report.
+    """
     in_dir = Path("data") / "raw" / f"series_{series_id}"
     events_path = in_dir / "events.jsonl"
     end_state_path = in_dir / "end_state.json"
@@ -253,36 +389,36 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
         print("Run: python -m mgi.cli.main series fetch --series-id <id>")
         return 1
 
-    kills = list(iter_kills_from_events_jsonl(events_path))
+    # Kills plus objective events (tower/plates/drakes/baron/voidgrubs/fortifier), one pass over the file
+    kills, objectives = load_events_jsonl(events_path)
     mistakes = extract_untraded_deaths_clustered(kills, fight_gap_seconds=DEFAULT_FIGHT_GAP_SECONDS)
 
-    # Load objective events (tower/plates/drakes/baron/voidgrubs/fortifier)
-    objectives = sorted(list(iter_objectives_from_events_jsonl(events_path)), key=lambda o: o.occurred_at)
+    objectives.sort(key=lambda o: o.occurred_at_ns)
+    objectives_ns = [o.occurred_at_ns for o in objectives]
 
-    # Total deaths per victim team (all kills against that team)
-    total_deaths_by_team = Counter(k.victim_team_id for k in kills)
+    # Total deaths per victim team (all kills against that team), indexed by team code
+    n_teams = len(kills.team_ids)
+    # Resolve display names once per team code instead of a dict lookup per printed/serialized row
+    team_name_by_code = [team_names.get(tid, "") for tid in kills.team_ids]
+    team_label_by_code = [name or tid for name, tid in zip(team_name_by_code, kills.team_ids)]
+    total_deaths_by_team = np.bincount(kills.victim_team_codes, minlength=n_teams)
 
     # Overall untraded rate (across all kills)
     overall_rate = (len(mistakes) / len(kills) * 100) if kills else 0.0
 
     # MVP "late mistakes matter more" gravity using elapsed minutes since first kill.
-    base_time = kills[0].occurred_at if kills else None
-
-    def gravity_mvp(occurred_at: datetime) -> int:
-        if not base_time:
-            return GRAVITY_BASE
-        mins = (occurred_at - base_time).total_seconds() / 60.0
-        if mins >= GRAVITY_LATE_MINUTES:
-            return GRAVITY_LATE
-        if mins >= GRAVITY_MID_MINUTES:
-            return GRAVITY_MID
-        return GRAVITY_BASE
-
-    # Team summary (using MVP gravity)
-    by_team_count = Counter(m.victim_team_id for m in mistakes)
-    by_team_gravity_mvp = defaultdict(int)
-    for m in mistakes:
-        by_team_gravity_mvp[m.victim_team_id] += gravity_mvp(m.occurred_at)
+    base_ns = int(kills.occurred_at_ns[0]) if kills else 0
+
+    # Computed once per mistake and reused by the payload and both summaries.
+    # One branchless lookup into the bucket table; no datetime or float math.
+    elapsed_ns = np.fromiter((m.occurred_at_ns for m in mistakes), dtype=np.int64, count=len(mistakes)) - base_ns
+    gravity_arr = GRAVITY_LEVELS[np.searchsorted(GRAVITY_THRESHOLDS_NS, elapsed_ns, side="right")]
+    gravities: List[int] = gravity_arr.tolist()
+
+    # Team summary (using MVP gravity): counts and gravity sums per team code in one C pass each
+    mistake_team_codes = np.fromiter((m.victim_team_code for m in mistakes), dtype=np.int32, count=len(mistakes))
+    team_counts = np.bincount(mistake_team_codes, minlength=n_teams)
+    team_gravity = np.bincount(mistake_team_codes, weights=gravity_arr, minlength=n_teams)
 
     out_dir = Path("data") / "derived" / f"series_{series_id}"
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -290,18 +426,31 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
     out_path = out_dir / "mistakes_untraded.json"
 
     payload: List[Dict[str, Any]] = []
-    for m in mistakes:
+    # Seconds from death to objective answer, kept beside the payload so rendering needn't reparse ISO strings
+    answer_delta_s: List[Optional[int]] = []
+    # Summary counters, accumulated in the same pass that builds the payload
+    answered_cnt = pressure_cnt = context_cnt = 0
+    baron_tower_teams: set[str] = set()
+    # Scoring inputs per mistake; the scores themselves are computed in one vectorized step afterwards
+    answered_flags: List[bool] = []
+    pressure_flags: List[bool] = []
+    context_flags: List[bool] = []
+    kind_weights: List[int] = []
+    for m, g_mvp in zip(mistakes, gravities):
         ans = objective_answered_after(
             objectives=objectives,
             victim_team_id=m.victim_team_id,
             death_time=m.occurred_at,
             window_seconds=DEFAULT_OBJECTIVE_ANSWER_WINDOW_SECONDS,
+            objectives_ns=objectives_ns,
+            death_time_ns=m.occurred_at_ns,
         )
 
         near_context = nearest_objective_window(
             objectives=objectives,
-            when=m.occurred_at,
+            when=m.occurred_at_ns,
             window_seconds=DEFAULT_CONTEXT_OBJECTIVE_WINDOW_SECONDS,
+            objectives_ns=objectives_ns,
         )
 
         near_obj_dict = None
@@ -313,7 +462,7 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
                 "teamId": obj.team_id,
                 "playerName": obj.player_name,
                 "rawType": obj.raw_type,
-                "occurredAt": obj.occurred_at.isoformat(),
+                "occurredAt": obj.occurred_at,
             }
 
         pressure_obj_dict = None
@@ -322,30 +471,35 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
             is_pressure = True
             pressure_obj_dict = near_obj_dict
 
-        g_mvp = gravity_mvp(m.occurred_at)
-        mgi_score = score_mgi(
-            gravity=g_mvp,
-            answered_by_objective=bool(ans),
-            is_pressure=is_pressure,
-            is_context=bool(near_obj_dict),
-            nearest_obj=near_obj_dict,
-        )
+        answered_flags.append(bool(ans))
+        pressure_flags.append(is_pressure)
+        context_flags.append(bool(near_obj_dict))
+        kind_weights.append(OBJ_KIND_WEIGHT.get(near_obj_dict["kind"].lower(), 0) if near_obj_dict else 0)
 
+        answer_delta_s.append(int((ans.occurred_at_ns - m.occurred_at_ns) / 1_000_000_000) if ans else None)
+        if ans:
+            answered_cnt += 1
+        if is_pressure:
+            pressure_cnt += 1
+        if near_obj_dict:
+            context_cnt += 1
+            if near_obj_dict["kind"] in ["baron", "tower"]:
+                baron_tower_teams.add(m.victim_team_id)
         payload.append(
             {
-                "occurredAt": m.occurred_at.isoformat(),
+                "occurredAt": m.occurred_at,
                 "victimName": m.victim_name,
                 "victimTeamId": m.victim_team_id,
-                "victimTeamName": team_names.get(m.victim_team_id, ""),
+                "victimTeamName": team_name_by_code[m.victim_team_code],
                 "kind": m.kind,
                 "gravity": m.gravity,
                 "gravityMvp": g_mvp,
-                "mgiScore": mgi_score,
+                "mgiScore": None,  # filled in below
                 "answeredByObjective": bool(ans),
                 "objectiveAnswer": (
                     {
                         "kind": ans.kind,
-                        "occurredAt": ans.occurred_at.isoformat(),
+                        "occurredAt": ans.occurred_at,
                         "teamId": ans.team_id,
                         "playerName": ans.player_name,
                         "rawType": ans.raw_type,
@@ -361,7 +515,19 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
             }
         )
 
-    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    mgi_scores = score_mgi_array(
+        gravity_arr,
+        np.array(answered_flags, dtype=np.bool_),
+        np.array(pressure_flags, dtype=np.bool_),
+        np.array(context_flags, dtype=np.bool_),
+        np.array(kind_weights, dtype=np.int64),
+    )
+    for p, score in zip(payload, mgi_scores.tolist()):
+        p["mgiScore"] = score
+
+    jsonio.write_pretty(out_path, payload)
+    if quiet:
+        return 0
 
     print(f"Fight cluster gap: {DEFAULT_FIGHT_GAP_SECONDS}s")
     print(f"Objective pressure window: ±{DEFAULT_PRESSURE_OBJECTIVE_WINDOW_SECONDS}s")
@@ -372,7 +538,6 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
     print(f"Untraded rate (overall): {overall_rate:.1f}%")
     print(f"Wrote: {out_path}\n")
 
-    answered_cnt = sum(1 for x in payload if x["answeredByObjective"])
     answered_rate = (answered_cnt / len(mistakes) * 100) if mistakes else 0.0
     print(
         f"Answered by objective (within {DEFAULT_OBJECTIVE_ANSWER_WINDOW_SECONDS}s): "
@@ -386,14 +551,12 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
         f"{unanswered_cnt}/{len(mistakes)} ({unanswered_rate:.1f}%)\n"
     )
 
-    pressure_cnt = sum(1 for x in payload if x["isPressureObjective"])
     pressure_rate = (pressure_cnt / len(mistakes) * 100) if mistakes else 0.0
     print(
         f"Objective Pressure (±{DEFAULT_PRESSURE_OBJECTIVE_WINDOW_SECONDS}s): "
         f"{pressure_cnt}/{len(mistakes)} ({pressure_rate:.1f}%)"
     )
 
-    context_cnt = sum(1 for x in payload if x["isNearObjective"])
     context_rate = (context_cnt / len(mistakes) * 100) if mistakes else 0.0
     print(
         f"Objective Context (±{DEFAULT_CONTEXT_OBJECTIVE_WINDOW_SECONDS}s): "
@@ -412,19 +575,16 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
     table.add_column("Objective Proximity", style="white")
     table.add_column("Details", style="dim")
 
-    top_payload = sorted(
-        payload,
-        key=lambda x: (x["mgiScore"], x["occurredAt"]),
-        reverse=True,
-    )[:top]
+    top_idx = heapq.nlargest(top, range(len(payload)), key=lambda i: (payload[i]["mgiScore"], payload[i]["occurredAt"]))
 
-    for p in top_payload:
+    for i in top_idx:
+        p = payload[i]
         team_label = p["victimTeamName"] or p["victimTeamId"]
         
         # Objective answer text
         ans = p["objectiveAnswer"]
         if ans:
-            delta_s = int((parse_dt(ans["occurredAt"]) - parse_dt(p["occurredAt"])).total_seconds())
+            delta_s = answer_delta_s[i]
             who = f" by {ans['playerName']}" if ans.get('playerName') else ""
             ans_txt = f"{ans['kind']}+{delta_s}s{who}"
         else:
@@ -454,7 +614,7 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
             score_txt = f"[bold green]{score_val}[/]"
 
         table.add_row(
-            p["occurredAt"],
+            p["occurredAt"].isoformat(),
             team_label,
             p["victimName"],
             str(p["gravityMvp"]),
@@ -464,7 +624,7 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
             p["details"]
         )
 
-    console.print(table)
+    _print_table(console, table)
 
     summary_table = Table(title="Team Summary (Victim Team)")
     summary_table.add_column("Team", style="magenta")
@@ -473,39 +633,45 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
     summary_table.add_column("Untraded Rate", justify="right", style="yellow")
     summary_table.add_column("Total Gravity (MVP)", justify="right", style="blue")
 
-    for team_id, untraded_cnt in by_team_count.most_common():
-        team_label = team_names.get(team_id, team_id)
-        total_deaths = total_deaths_by_team.get(team_id, 0)
+    for code in _most_common_codes(mistake_team_codes, n_teams).tolist():
+        team_label = team_label_by_code[code]
+        untraded_cnt = int(team_counts[code])
+        total_deaths = int(total_deaths_by_team[code])
         rate = (untraded_cnt / total_deaths * 100) if total_deaths else 0.0
         summary_table.add_row(
             team_label,
             str(untraded_cnt),
             str(total_deaths),
             f"{rate:.1f}%",
-            str(by_team_gravity_mvp[team_id])
+            str(int(team_gravity[code]))
         )
 
-    console.print(summary_table)
+    _print_table(console, summary_table)
 
     # Player leaderboard (top 10 victims), using MVP gravity totals
-    by_player_count = Counter(m.victim_name for m in mistakes)
-    by_player_gravity_mvp = defaultdict(int)
-    for m in mistakes:
-        by_player_gravity_mvp[m.victim_name] += gravity_mvp(m.occurred_at)
+    player_codes: dict[str, int] = {}
+    mistake_player_codes = np.fromiter(
+        (player_codes.setdefault(m.victim_name, len(player_codes)) for m in mistakes),
+        dtype=np.int32,
+        count=len(mistakes),
+    )
+    player_names = list(player_codes)
+    player_counts = np.bincount(mistake_player_codes, minlength=len(player_names))
+    player_gravity = np.bincount(mistake_player_codes, weights=gravity_arr, minlength=len(player_names))
 
     player_table = Table(title="Player Summary (Victims)")
     player_table.add_column("Player", style="green")
     player_table.add_column("Count", justify="right", style="cyan")
     player_table.add_column("Total Gravity (MVP)", justify="right", style="blue")
 
-    for name, cnt in by_player_count.most_common(10):
+    for code in _most_common_codes(mistake_player_codes, len(player_names))[:10].tolist():
         player_table.add_row(
-            name,
-            str(cnt),
-            str(by_player_gravity_mvp[name])
+            player_names[code],
+            str(int(player_counts[code])),
+            str(int(player_gravity[code]))
         )
 
-    console.print(player_table)
+    _print_table(console, player_table)
 
     # Option B: mgiScore distribution
     dist_table = Table(title="MGI Score Distribution")
@@ -513,14 +679,13 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
     dist_table.add_column("Severity", style="magenta")
     dist_table.add_column("Count", justify="right", style="green")
 
-    low = sum(1 for x in payload if x["mgiScore"] <= 30)
-    mid = sum(1 for x in payload if 31 <= x["mgiScore"] <= 45)
-    high = sum(1 for x in payload if x["mgiScore"] >= 46)
-
+    low = int(np.count_nonzero(mgi_scores <= 30))
+    high = int(np.count_nonzero(mgi_scores >= 46))
+    mid = len(mgi_scores) - low - high
     dist_table.add_row("0–30", "Low Impact", str(low))
     dist_table.add_row("31–45", "Medium", str(mid))
     dist_table.add_row("46+", "High Impact", str(high))
-    console.print(dist_table)
+    _print_table(console, dist_table)
 
     # Option A: Coach Summary
     print("\nCoach Insight:")
@@ -533,24 +698,39 @@ def run(series_id: str, top: int = 10, window_seconds: int = DEFAULT_WINDOW_SECO
 
     # Dignitas suffered the highest MGI impact during Baron and tower windows.
     # We can find the team with the highest total MGI score
-    by_team_mgi = defaultdict(int)
-    for x in payload:
-        by_team_mgi[x["victimTeamId"]] += x["mgiScore"]
-    
-    if by_team_mgi:
-        top_team_id = max(by_team_mgi, key=by_team_mgi.get)
+    if mistakes:
+        top_team_id = kills.team_ids[_most_common_codes(mistake_team_codes, n_teams, weights=mgi_scores)[0]]
         top_team_name = team_names.get(top_team_id, top_team_id)
         
         # Check if they had Baron/Tower pressure
-        has_baron_tower = any(
-            x["victimTeamId"] == top_team_id and 
-            x["isNearObjective"] and 
-            x["nearObjective"]["kind"] in ["baron", "tower"] 
-            for x in payload
-        )
-        if has_baron_tower:
+        if top_team_id in baron_tower_teams:
             print(f" • {top_team_name} suffered the highest MGI impact during Baron and tower windows.")
         else:
             print(f" • {top_team_name} suffered the highest cumulative MGI impact.")
 
     return 0
+
+
+def run_many(
+    series_ids: Sequence[str],
+    top: int = 10,
+    window_seconds: int = DEFAULT_WINDOW_SECONDS,
+    workers: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Runs `run` for several series in parallel worker processes (the work is CPU-bound and
+    series share nothing). Workers run quietly so their reports don't interleave.
+    Returns the exit code per series id, in input order. A series that raises (missing or
+    malformed files) is reported and gets exit code 1; the others still complete.
+    """
+    codes: Dict[str, int] = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, series_id, top, window_seconds, True): series_id for series_id in series_ids}
+        for future in as_completed(futures):
+            series_id = futures[future]
+            try:
+                codes[series_id] = future.result()
+            except Exception as e:
+                print(f"[WARN] Series {series_id} failed: {e}")
+                codes[series_id] = 1
+    return {series_id: codes[series_id] for series_id in series_ids}
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import json
-from mgi.common.time import parse_dt
+import sys
+from bisect import bisect_left
+from mgi.common import jsonio
+from mgi.common.time import parse_dt, to_epoch_ns
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -10,9 +12,10 @@ from typing import Any, Dict, Iterable, Optional, Sequence
 
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ObjectiveEvent:
     occurred_at: datetime
+    occurred_at_ns: int    # epoch-ns, for integer time arithmetic
     kind: str              # "baron", "drake_ocean", "tower", "plate", "voidgrub", "fortifier"
     team_id: str           # team credited
     player_name: str       # optional, can be blank
@@ -38,7 +41,6 @@ OBJECTIVE_TYPE_MAP: dict[str, str] = {
     "player-completed-destroyTurretPlateTop": "plate",
     "player-completed-destroyTurretPlateBot": "plate",
     "team-completed-destroyTurretPlateBot": "plate",
-    "player-completed-destroyTurretPlateTop": "plate",
 
     # Void grubs
     "player-completed-slayVoidGrub": "voidgrub",
@@ -48,67 +50,111 @@ OBJECTIVE_TYPE_MAP: dict[str, str] = {
     "player-completed-destroyFortifier": "fortifier",
 }
 
+# Shared stand-in for absent or null actor/target/state objects in parsed events; only ever
+# read, so one instance serves every event (the kill loader imports it too)
+_EMPTY: Dict[str, Any] = {}
+
+# The "-<verb>-" segments of the GRID types above ("<actor>-<verb>-<target>"), derived so new
+# map keys are always covered; lines containing none of them can skip JSON decoding
+OBJECTIVE_EVENT_MARKERS: tuple[bytes, ...] = tuple(
+    dict.fromkeys(f"-{t.split('-')[1]}-".encode() for t in OBJECTIVE_TYPE_MAP)
+)
+
 
 def _extract_team_and_name(actor: dict) -> tuple[str, str]:
     """
     In your kill parser you used actor.state.teamId and actor.state.name.
     Keep the same approach here.
     """
-    state = actor.get("state", {}) or {}
-    team_id = str(state.get("teamId", "")).strip()
-    name = str(state.get("name", "")).strip()
+    state = actor.get("state") or _EMPTY
+    team_id = sys.intern(str(state.get("teamId", "")).strip())
+    name = sys.intern(str(state.get("name", "")).strip())
     return team_id, name
 
 
+def has_objective_marker(line: bytes) -> bool:
+    for marker in OBJECTIVE_EVENT_MARKERS:
+        if marker in line:
+            return True
+    return False
+
+
+def objective_from_event(ev: dict, occurred_at: datetime, occurred_at_ns: int) -> Optional[ObjectiveEvent]:
+    """
+    Builds the ObjectiveEvent for one GRID event of an envelope, or None if it is not an objective.
+    """
+    ev_type = ev.get("type")
+    # Parsed types are already clean strings: one dict probe, no str()/strip() copy
+    kind = OBJECTIVE_TYPE_MAP.get(ev_type) if isinstance(ev_type, str) else None
+    if kind is None:
+        return None
+
+    # Prefer actor.state.teamId for credit
+    actor = ev.get("actor") or _EMPTY
+    team_id, player_name = _extract_team_and_name(actor)
+
+    # Some events might store teamId elsewhere; try a couple fallbacks
+    if not team_id:
+        team_id = str(ev.get("teamId", "")).strip() or str((ev.get("state") or _EMPTY).get("teamId", "")).strip()
+        team_id = sys.intern(team_id)
+
+    return ObjectiveEvent(
+        occurred_at=occurred_at,
+        occurred_at_ns=occurred_at_ns,
+        kind=kind,
+        team_id=team_id,
+        player_name=player_name,
+        raw_type=sys.intern(ev_type),
+    )
+
+
 def iter_objectives_from_events_jsonl(path: Path) -> Iterable[ObjectiveEvent]:
-    with path.open("r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                envelope: Dict[str, Any] = json.loads(line)
-                occurred_at = parse_dt(envelope["occurredAt"])
-            except Exception:
-                continue
-
-            events = envelope.get("events", [])
-            if not isinstance(events, list):
-                continue
-
-            for ev in events:
-                ev_type = str(ev.get("type", "")).strip()
-                if ev_type not in OBJECTIVE_TYPE_MAP:
-                    continue
-
-                # Prefer actor.state.teamId for credit
-                actor = ev.get("actor", {}) or {}
-                team_id, player_name = _extract_team_and_name(actor)
-
-                # Some events might store teamId elsewhere; try a couple fallbacks
-                if not team_id:
-                    team_id = str(ev.get("teamId", "")).strip() or str((ev.get("state", {}) or {}).get("teamId", "")).strip()
-
-                yield ObjectiveEvent(
-                    occurred_at=occurred_at,
-                    kind=OBJECTIVE_TYPE_MAP[ev_type],
-                    team_id=team_id,
-                    player_name=player_name,
-                    raw_type=ev_type,
-                )
+    for _line_no, line in jsonio.iter_jsonl_lines(path):
+        if not has_objective_marker(line):
+            continue
+        try:
+            envelope: Dict[str, Any] = jsonio.loads(line)
+            occurred_at = parse_dt(envelope["occurredAt"])
+        except Exception:
+            continue
+
+        events = envelope.get("events", [])
+        if not isinstance(events, list):
+            continue
+
+        occurred_at_ns = to_epoch_ns(occurred_at)
+        for ev in events:
+            obj = objective_from_event(ev, occurred_at, occurred_at_ns)
+            if obj is not None:
+                yield obj
 
 def objective_answered_after(
     objectives: Sequence[ObjectiveEvent],
     victim_team_id: str,
     death_time: datetime,
     window_seconds: int = 90,
+    objectives_ns: Optional[Sequence[int]] = None,
+    death_time_ns: Optional[int] = None,
 ) -> Optional[ObjectiveEvent]:
     """
     Returns the first objective taken by victim team within window after death.
+
+    If `objectives` is sorted by time, pass their epoch-ns keys as `objectives_ns`:
+    the window start is then found by bisection and only objectives inside it are visited.
+    `death_time_ns`, if the caller already has it, saves converting `death_time`.
     """
+    if objectives_ns is not None:
+        start_ns = death_time_ns if death_time_ns is not None else to_epoch_ns(death_time)
+        end_ns = start_ns + window_seconds * 1_000_000_000
+        for i in range(bisect_left(objectives_ns, start_ns), len(objectives_ns)):
+            if objectives_ns[i] > end_ns:
+                break
+            if objectives[i].team_id == victim_team_id:
+                return objectives[i]
+        return None
+
     t_end = death_time + timedelta(seconds=window_seconds)
     for obj in objectives:
         if obj.team_id == victim_team_id and death_time <= obj.occurred_at <= t_end:
             return obj
-    return None
\ No newline at end of file
+    return None
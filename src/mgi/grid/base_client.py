@@ -1,31 +1,57 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# Keep-alive connections kept per host; sized for concurrent downloads sharing one session
+POOL_SIZE = 20
 
-@dataclass
+# Transient failures (rate limiting, gateway errors) are retried with exponential backoff.
+# Only idempotent methods are retried, so GraphQL POSTs are never replayed.
+# The last response is handed back rather than raised, so callers still see raise_for_status() errors.
+RETRY = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), raise_on_status=False)
+
+_ClientT = TypeVar("_ClientT", bound="BaseGridClient")
+
+
+@dataclass(slots=True)
 class BaseGridClient:
     api_key: str
     base_url: str
     timeout_s: int = 30
     session: requests.Session = field(init=False)
+    _base: str = field(init=False, repr=False)  # base_url without trailing "/", joined per request
 
     def __post_init__(self) -> None:
+        self._base = self.base_url.rstrip("/")
         self.session = requests.Session()
         self.session.headers.update({"x-api-key": self.api_key})
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self: _ClientT) -> _ClientT:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     def get(self, path: str, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> requests.Response:
-        url = self.base_url.rstrip("/") + "/" + path.lstrip("/")
+        url = self._base + "/" + path.lstrip("/")
         timeout = kwargs.pop("timeout", self.timeout_s)
         r = self.session.get(url, params=params, timeout=timeout, **kwargs)
         r.raise_for_status()
         return r
 
     def post_json(self, path: str, payload: Dict[str, Any], **kwargs: Any) -> requests.Response:
-        url = self.base_url.rstrip("/") + "/" + path.lstrip("/")
+        url = self._base + "/" + path.lstrip("/")
         timeout = kwargs.pop("timeout", self.timeout_s)
         r = self.session.post(url, json=payload, timeout=timeout, **kwargs)
         r.raise_for_status()
@@ -1,17 +1,71 @@
 from __future__ import annotations
+import hashlib
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, Optional
+from mgi.common import jsonio
 from mgi.grid.base_client import BaseGridClient
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def _query_sha256(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def _error_codes(data: Dict[str, Any]) -> set[str]:
+    """Collects message / extensions.code of GraphQL errors (APQ servers use either)."""
+    codes: set[str] = set()
+    for err in data.get("errors") or []:
+        if isinstance(err, dict):
+            codes.add(str(err.get("message", "")))
+            codes.add(str((err.get("extensions") or {}).get("code", "")))
+    return codes
+
+
+@dataclass(slots=True)
 class GridGraphQLClient(BaseGridClient):
-    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        payload = {"query": query, "variables": variables or {}}
+    # Opt-in Automatic Persisted Queries: send only the query's sha256 and fall back to
+    # (and register) the full text when the server doesn't know it yet.
+    persisted_queries: bool = False
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         # We don't need to specify headers here as BaseGridClient handles x-api-key
         # and we can use post_json from BaseGridClient
         r = self.post_json("", payload=payload, timeout=60)
-        data = r.json()
+        return jsonio.loads(r.content)
+
+    def _post_persisted(self, variables: Dict[str, Any], extensions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Sends the hash-only request. Returns the response body when the server answered it,
+        or None when the full query text has to be sent: an unknown hash, or a server without
+        APQ, whether it says so with PERSISTED_QUERY_NOT_SUPPORTED, another GraphQL error or
+        an HTTP 4xx/5xx. Only PERSISTED_QUERY_NOT_FOUND keeps APQ on for later queries.
+        """
+        r = self.session.post(self._base + "/", json={"variables": variables, "extensions": extensions}, timeout=60)
+        try:
+            data = jsonio.loads(r.content)
+        except ValueError:
+            data = None
+        if r.ok and isinstance(data, dict) and not data.get("errors"):
+            return data
+
+        codes = _error_codes(data) if isinstance(data, dict) else set()
+        if "PERSISTED_QUERY_NOT_FOUND" not in codes:
+            self.persisted_queries = False
+        return None
+
+    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"query": query, "variables": variables or {}}
+
+        data = None
+        if self.persisted_queries:
+            extensions = {"persistedQuery": {"version": 1, "sha256Hash": _query_sha256(query)}}
+            data = self._post_persisted(payload["variables"], extensions)
+            if data is None and self.persisted_queries:
+                # Unknown hash: the full text plus the hash registers the query for next time
+                payload["extensions"] = extensions
+        if data is None:
+            data = self._post(payload)
 
         if "errors" in data and data["errors"]:
             raise RuntimeError(f"GRID GraphQL errors: {data['errors']}")
@@ -19,4 +73,4 @@ class GridGraphQLClient(BaseGridClient):
         if "data" not in data:
             raise RuntimeError(f"Unexpected response: {data}")
 
-        return data["data"]
\ No newline at end of file
+        return data["data"]
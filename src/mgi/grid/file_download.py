@@ -1,18 +1,126 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-import json
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+import os
+import shutil
+import struct
 import zipfile
-from mgi.grid.base_client import BaseGridClient
 
+try:
+    # ISA-L's inflate is markedly faster than stdlib zlib on large event dumps
+    from isal import isal_zlib
+except ImportError:  # optional speedup: pip install mistake-gravity-index[fast]
+    isal_zlib = None
 
-@dataclass
+from mgi.common import jsonio
+from mgi.grid.base_client import POOL_SIZE, BaseGridClient
+
+_COPY_CHUNK = 1024 * 1024
+# Request headers for fetching files as-is (they are already compressed archives)
+_IDENTITY_ENCODING = {"Accept-Encoding": "identity"}
+_LOCAL_HEADER = struct.Struct("<4s22xHH")  # signature, then file name / extra field lengths
+
+
+def _member_data_offset(raw: BinaryIO, info: zipfile.ZipInfo) -> int:
+    """Archive offset of a member's (compressed) data, read from its local file header."""
+    raw.seek(info.header_offset)
+    signature, name_len, extra_len = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+    if signature != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    return info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+
+
+def _sendfile_member(raw: BinaryIO, info: zipfile.ZipInfo, dst: BinaryIO) -> None:
+    """Copies a STORED member kernel-to-kernel with os.sendfile; its bytes are the file contents."""
+    offset = _member_data_offset(raw, info)
+    remaining = info.file_size
+    while remaining:
+        sent = os.sendfile(dst.fileno(), raw.fileno(), offset, remaining)
+        if sent == 0:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        offset += sent
+        remaining -= sent
+
+
+def _inflate_member_isal(raw: BinaryIO, info: zipfile.ZipInfo, dst: BinaryIO) -> None:
+    """Streams a DEFLATE member straight from the archive through ISA-L, checking its CRC."""
+    raw.seek(_member_data_offset(raw, info))
+    inflater = isal_zlib.decompressobj(-15)
+    crc = 0
+    remaining = info.compress_size
+    while remaining:
+        chunk = raw.read(min(remaining, _COPY_CHUNK))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        remaining -= len(chunk)
+        # Bound each inflate step: highly compressed JSONL would otherwise expand a whole
+        # read into one buffer many times its size. A short step means the read is drained
+        # (ISA-L can still hold inflated output after consuming all input).
+        while True:
+            out = inflater.decompress(chunk, _COPY_CHUNK)
+            crc = isal_zlib.crc32(out, crc)
+            dst.write(out)
+            chunk = inflater.unconsumed_tail
+            if not chunk and len(out) < _COPY_CHUNK:
+                break
+    out = inflater.flush()
+    crc = isal_zlib.crc32(out, crc)
+    dst.write(out)
+
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for {info.filename}")
+
+
+@dataclass(slots=True)
 class GridFileDownloadClient(BaseGridClient):
+    # Optional directory persisting file listings with their ETags across runs
+    listing_cache_dir: Optional[Path] = None
+    _listing_cache: Dict[str, Tuple[str, bytes]] = field(default_factory=dict, init=False, repr=False)
+
     def list_files(self, series_id: str) -> dict:
+        """
+        Fetches the series' file listing. Listings are kept with their ETag and revalidated
+        with If-None-Match, so an unchanged listing costs one round trip with an empty body.
+        """
         path = f"file-download/list/{series_id}"
-        r = self.get(path, timeout=60)
-        return r.json()
+        cached = self._listing_cache.get(series_id) or self._load_cached_listing(series_id)
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        r = self.get(path, timeout=60, headers=headers)
+        if r.status_code == 304 and cached:
+            try:
+                return jsonio.loads(cached[1])
+            except ValueError:
+                # Corrupt cached body: forget it and fetch the listing unconditionally
+                self._listing_cache.pop(series_id, None)
+                r = self.get(path, timeout=60)
+
+        etag = r.headers.get("ETag")
+        if etag:
+            self._listing_cache[series_id] = (etag, r.content)
+            self._store_cached_listing(series_id, etag, r.content)
+        return jsonio.loads(r.content)
+
+    def _load_cached_listing(self, series_id: str) -> Optional[Tuple[str, bytes]]:
+        if self.listing_cache_dir is None:
+            return None
+        etag_path = self.listing_cache_dir / f"{series_id}.etag"
+        body_path = self.listing_cache_dir / f"{series_id}.json"
+        if not (etag_path.exists() and body_path.exists()):
+            return None
+        cached = (etag_path.read_text(encoding="utf-8"), body_path.read_bytes())
+        self._listing_cache[series_id] = cached
+        return cached
+
+    def _store_cached_listing(self, series_id: str, etag: str, body: bytes) -> None:
+        if self.listing_cache_dir is None:
+            return
+        self.listing_cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.listing_cache_dir / f"{series_id}.json").write_bytes(body)
+        (self.listing_cache_dir / f"{series_id}.etag").write_text(etag, encoding="utf-8")
 
     def download_bytes(self, full_url: str) -> bytes:
         # Since full_url is provided, we might bypass the base_url logic in get() 
@@ -24,30 +132,81 @@ class GridFileDownloadClient(BaseGridClient):
         r.raise_for_status()
         return r.content
 
-    def download_to(self, full_url: str, out_path: Path) -> Path:
+    def download_to(self, full_url: str, out_path: Path, skip_existing: bool = True) -> Path:
+        """
+        Streams `full_url` to `out_path`. With `skip_existing`, a local file is kept when a HEAD
+        request reports the same Content-Length and, if the server sends an ETag, the one
+        recorded next to the file by the previous download.
+        """
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.session.get(full_url, stream=True, timeout=180) as r:
+        etag_path = out_path.with_name(out_path.name + ".etag")
+        if skip_existing and out_path.exists() and self._is_up_to_date(full_url, out_path, etag_path):
+            return out_path
+
+        with self.session.get(full_url, stream=True, timeout=180, headers=_IDENTITY_ENCODING) as r:
             r.raise_for_status()
-            with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 256):
-                    if chunk:
-                        f.write(chunk)
+            # Copy the raw stream in 1 MiB blocks in C; decode_content keeps iter_content's
+            # transparent gzip/deflate handling. copyfileobj batches, so the file is unbuffered.
+            r.raw.decode_content = True
+            with open(out_path, "wb", buffering=0) as f:
+                shutil.copyfileobj(r.raw, f, length=1024 * 1024)
+            etag = r.headers.get("ETag")
+        if etag:
+            etag_path.write_text(etag, encoding="utf-8")
+        else:
+            etag_path.unlink(missing_ok=True)
         return out_path
 
+    def _is_up_to_date(self, full_url: str, out_path: Path, etag_path: Path) -> bool:
+        head = self.session.head(full_url, timeout=30, allow_redirects=True, headers=_IDENTITY_ENCODING)
+        if not head.ok:
+            return False
+        size = head.headers.get("Content-Length")
+        if size is None or int(size) != out_path.stat().st_size:
+            return False
+        etag = head.headers.get("ETag")
+        if etag:
+            return etag_path.exists() and etag_path.read_text(encoding="utf-8") == etag
+        return True
+
+    def download_many(self, items: Sequence[Tuple[str, Path]], concurrency: int = 8) -> List[Path]:
+        """
+        Downloads several (url, out_path) pairs concurrently over the pooled session.
+        Returns the written paths in input order; the first failure is re-raised.
+
+        Threads are enough here: the GIL is released while waiting on sockets and writing files.
+        Concurrency is capped at the session's pool size so no connection is opened and discarded.
+        """
+        if not items:
+            return []
+        workers = max(1, min(concurrency, POOL_SIZE, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda item: self.download_to(*item), items))
+
     @staticmethod
     def unzip_first_jsonl(zip_path: Path, out_jsonl_path: Path) -> Path:
         out_jsonl_path.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            jsonl_names = [n for n in zf.namelist() if n.endswith(".jsonl")]
-            if not jsonl_names:
+        with open(zip_path, "rb") as raw, zipfile.ZipFile(raw, "r") as zf:
+            jsonl_info = next((i for i in zf.infolist() if i.filename.endswith(".jsonl")), None)
+            if jsonl_info is None:
                 raise RuntimeError(f"No .jsonl found inside zip: {zip_path.name}")
-            name = jsonl_names[0]
-            with zf.open(name) as src, open(out_jsonl_path, "wb") as dst:
-                dst.write(src.read())
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(raw.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+            plain = not jsonl_info.flag_bits & 0x1  # not encrypted
+            with open(out_jsonl_path, "wb") as dst:
+                if plain and jsonl_info.compress_type == zipfile.ZIP_STORED and hasattr(os, "sendfile"):
+                    _sendfile_member(raw, jsonl_info, dst)
+                elif plain and jsonl_info.compress_type == zipfile.ZIP_DEFLATED and isal_zlib is not None:
+                    _inflate_member_isal(raw, jsonl_info, dst)
+                else:
+                    # Stream in 1 MiB chunks: the decompressed dump can be far larger than RAM allows
+                    with zf.open(jsonl_info) as src:
+                        shutil.copyfileobj(src, dst, length=_COPY_CHUNK)
         return out_jsonl_path
 
     @staticmethod
     def pretty_save_json(obj: dict, out_path: Path) -> Path:
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
+        jsonio.write_pretty(out_path, obj)
         return out_path
\ No newline at end of file
@@ -1,15 +1,23 @@
 # Central Data API queries
+import re
 
-TITLES_QUERY = """
+
+def _minify(query: str) -> str:
+    # Collapse whitespace once at import so each POST carries the compact form.
+    # Safe for these queries: none contains string literals.
+    return re.sub(r"\s+", " ", query).strip()
+
+
+TITLES_QUERY = _minify("""
 query Titles {
   titles {
     id
     name
   }
 }
-"""
+""")
 
-TOURNAMENTS_BY_TITLE_QUERY = """
+TOURNAMENTS_BY_TITLE_QUERY = _minify("""
 query Tournaments($titleIds: [ID!]) {
   tournaments(filter: { title: { id: { in: $titleIds } } }) {
     edges {
@@ -17,9 +25,9 @@ query Tournaments($titleIds: [ID!]) {
     }
   }
 }
-"""
+""")
 
-ALL_SERIES_BY_TOURNAMENT_QUERY = """
+ALL_SERIES_BY_TOURNAMENT_QUERY = _minify("""
 query AllSeries($tournamentId: ID!, $after: Cursor) {
   allSeries(
     filter: { tournament: { id: { in: [$tournamentId] }, includeChildren: { equals: true } } }
@@ -40,4 +48,4 @@ query AllSeries($tournamentId: ID!, $after: Cursor) {
     pageInfo { endCursor hasNextPage }
   }
 }
-"""
\ No newline at end of file
+""")
@@ -1,9 +1,31 @@
 import logging
 import os
+from functools import lru_cache
+
+from mgi.config import load_env
+
+
+@lru_cache(maxsize=1)
+def log_level() -> str:
+    """MGI_LOG_LEVEL (default INFO), read from the environment / .env once."""
+    load_env()
+    return os.getenv("MGI_LOG_LEVEL", "INFO").upper()
+
 
 def setup_logging() -> None:
-    level = os.getenv("MGI_LOG_LEVEL", "INFO").upper()
+    """
+    Configures root logging from MGI_LOG_LEVEL (default INFO).
+
+    Our format only uses level and message, so records skip the caller lookup (a stack walk
+    per call) and the thread/process name lookups. The trade-off: %(filename)s, %(lineno)d,
+    %(funcName)s, %(threadName)s and %(processName)s are not populated in custom formats.
+    """
     logging.basicConfig(
-        level=level,
+        level=log_level(),
         format="%(levelname)s %(message)s",
-    )
\ No newline at end of file
+    )
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None
+
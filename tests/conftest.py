@@ -0,0 +1,60 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+import requests
+
+TESTS_DIR = Path(__file__).resolve().parent
+
+
+class StubSession:
+    """
+    Stands in for a client's requests.Session: replays queued (status, body, headers) responses
+    in order and records each request as (method, url, kwargs) in `calls`.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def _respond(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        status, body, headers = self.responses.pop(0)
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        r = requests.Response()
+        r.status_code = status
+        r.reason = "Stub"
+        r.url = url
+        r.headers.update(headers)
+        r._content = body
+        r.raw = io.BytesIO(body)
+        return r
+
+    def get(self, url, **kwargs):
+        return self._respond("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self._respond("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._respond("POST", url, **kwargs)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stub_session():
+    return StubSession
+
+
+@pytest.fixture(scope="session")
+def events_small_path():
+    return TESTS_DIR / "fixtures" / "events_small.jsonl"
+
+
+@pytest.fixture(scope="session")
+def expected_untraded():
+    return json.loads((TESTS_DIR / "expected" / "mistakes_untraded_expected.json").read_text(encoding="utf-8"))
@@ -0,0 +1,65 @@
+import pytest
+
+from mgi.grid.client import GridGraphQLClient
+
+QUERY = "query Titles { titles { id } }"
+OK = {"data": {"titles": [{"id": "3"}]}}
+
+
+def _client(session):
+    client = GridGraphQLClient(api_key="k", base_url="https://grid.test/graphql/", persisted_queries=True)
+    client.session = session
+    return client
+
+
+def _sent_query(call):
+    return call[2]["json"].get("query")
+
+
+def test_known_hash_is_answered_without_query_text(stub_session):
+    session = stub_session((200, OK, {}))
+    client = _client(session)
+
+    assert client.query(QUERY) == OK["data"]
+    assert [_sent_query(c) for c in session.calls] == [None]
+    assert client.persisted_queries
+
+
+def test_not_found_registers_full_query(stub_session):
+    not_found = {"errors": [{"message": "PersistedQueryNotFound", "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"}}]}
+    session = stub_session((200, not_found, {}), (200, OK, {}))
+    client = _client(session)
+
+    assert client.query(QUERY) == OK["data"]
+    assert [_sent_query(c) for c in session.calls] == [None, QUERY]
+    assert "persistedQuery" in session.calls[1][2]["json"]["extensions"]
+    assert client.persisted_queries
+
+
+@pytest.mark.parametrize(
+    "status, body",
+    [
+        (200, {"errors": [{"message": "PERSISTED_QUERY_NOT_SUPPORTED"}]}),
+        (200, {"errors": [{"message": "Must provide query string."}]}),
+        (400, {"errors": [{"message": "Must provide query string."}]}),
+        (404, b"Not Found"),
+    ],
+)
+def test_server_without_apq_falls_back_to_plain_queries(stub_session, status, body):
+    session = stub_session((status, body, {}), (200, OK, {}), (200, OK, {}))
+    client = _client(session)
+
+    assert client.query(QUERY) == OK["data"]
+    assert client.query(QUERY) == OK["data"]
+    assert [_sent_query(c) for c in session.calls] == [None, QUERY, QUERY]
+    assert all("extensions" not in c[2]["json"] for c in session.calls[1:])
+    assert not client.persisted_queries
+
+
+def test_plain_query_errors_still_raise(stub_session):
+    session = stub_session((200, {"errors": [{"message": "boom"}]}, {}))
+    client = GridGraphQLClient(api_key="k", base_url="https://grid.test/graphql")
+    client.session = session
+
+    with pytest.raises(RuntimeError, match="boom"):
+        client.query(QUERY)
@@ -0,0 +1,153 @@
+import zipfile
+
+import pytest
+
+from mgi.grid import file_download
+from mgi.grid.file_download import GridFileDownloadClient
+
+
+@pytest.mark.parametrize("use_isal", [True, False])
+@pytest.mark.parametrize("compression", [zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED])
+def test_unzip_first_jsonl(tmp_path, monkeypatch, use_isal, compression):
+    if use_isal and file_download.isal_zlib is None:
+        pytest.skip("isal not installed")
+    if not use_isal:
+        monkeypatch.setattr(file_download, "isal_zlib", None)
+
+    data = b'{"occurredAt": "2024-06-15T22:56:54.799Z", "events": []}\n' * 5000
+    zip_path = tmp_path / "events.jsonl.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=compression) as zf:
+        zf.writestr("readme.txt", "not this one")
+        zf.writestr("series/events.jsonl", data)
+
+    out = GridFileDownloadClient.unzip_first_jsonl(zip_path, tmp_path / "out" / "events.jsonl")
+    assert out.read_bytes() == data
+
+
+
+def test_isal_inflate_is_bounded_per_step(tmp_path, monkeypatch):
+    if file_download.isal_zlib is None:
+        pytest.skip("isal not installed")
+    # Small steps so each compressed read inflates through several unconsumed_tail rounds
+    monkeypatch.setattr(file_download, "_COPY_CHUNK", 1024)
+
+    data = b'{"occurredAt": "2024-06-15T22:56:54.799Z", "events": []}\n' * 50_000
+    zip_path = tmp_path / "events.jsonl.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        zf.writestr("events.jsonl", data)
+
+    writes = []
+
+    class Recorder:
+        def write(self, b):
+            writes.append(len(b))
+
+    with open(zip_path, "rb") as raw, zipfile.ZipFile(raw) as zf:
+        file_download._inflate_member_isal(raw, zf.infolist()[0], Recorder())
+    assert sum(writes) == len(data)
+    assert max(writes) <= 1024
+
+
+LISTING = {"files": [{"id": "events-grid", "fullURL": "https://grid.test/events.zip"}]}
+
+
+def _download_client(session, cache_dir=None):
+    client = GridFileDownloadClient(api_key="k", base_url="https://grid.test/", listing_cache_dir=cache_dir)
+    client.session = session
+    return client
+
+
+def _if_none_match(call):
+    return (call[2].get("headers") or {}).get("If-None-Match")
+
+
+def test_list_files_revalidates_with_etag(tmp_path, stub_session):
+    session = stub_session((200, LISTING, {"ETag": '"v1"'}), (304, b"", {}))
+    cache_dir = tmp_path / "cache"
+
+    assert _download_client(session, cache_dir).list_files("42") == LISTING
+    # A new client (next CLI run) reuses the listing persisted on disk
+    assert _download_client(session, cache_dir).list_files("42") == LISTING
+    assert session.calls[0][1] == "https://grid.test/file-download/list/42"
+    assert [_if_none_match(c) for c in session.calls] == [None, '"v1"']
+
+
+def test_list_files_replaces_listing_on_changed_etag(tmp_path, stub_session):
+    changed = {"files": []}
+    session = stub_session((200, LISTING, {"ETag": '"v1"'}), (200, changed, {"ETag": '"v2"'}), (304, b"", {}))
+    client = _download_client(session, tmp_path)
+
+    assert client.list_files("42") == LISTING
+    assert client.list_files("42") == changed
+    assert client.list_files("42") == changed
+    assert [_if_none_match(c) for c in session.calls] == [None, '"v1"', '"v2"']
+    assert (tmp_path / "42.etag").read_text(encoding="utf-8") == '"v2"'
+
+
+def test_list_files_refetches_when_cached_body_is_corrupt(tmp_path, stub_session):
+    (tmp_path / "42.etag").write_text('"v1"', encoding="utf-8")
+    (tmp_path / "42.json").write_bytes(b'{"files": [')
+    session = stub_session((304, b"", {}), (200, LISTING, {"ETag": '"v1"'}))
+
+    assert _download_client(session, tmp_path).list_files("42") == LISTING
+    assert [_if_none_match(c) for c in session.calls] == ['"v1"', None]
+    assert (tmp_path / "42.json").read_bytes() == b'{"files": [{"id": "events-grid", "fullURL": "https://grid.test/events.zip"}]}'
+
+
+def test_list_files_ignores_etag_without_cached_body(tmp_path, stub_session):
+    (tmp_path / "42.etag").write_text('"v1"', encoding="utf-8")
+    session = stub_session((200, LISTING, {}))
+
+    assert _download_client(session, tmp_path).list_files("42") == LISTING
+    assert [_if_none_match(c) for c in session.calls] == [None]
+
+
+URL = "https://files.grid.test/events.jsonl.zip"
+BODY = b"PK" + b"\x00" * 62
+
+
+def _existing_download(tmp_path, etag=None):
+    out = tmp_path / "events.jsonl.zip"
+    out.write_bytes(BODY)
+    if etag is not None:
+        out.with_name(out.name + ".etag").write_text(etag, encoding="utf-8")
+    return out
+
+
+def test_download_to_skips_file_matching_head(tmp_path, stub_session):
+    out = _existing_download(tmp_path, etag='"v1"')
+    session = stub_session((200, b"", {"Content-Length": str(len(BODY)), "ETag": '"v1"'}))
+
+    assert _download_client(session).download_to(URL, out) == out
+    assert [c[0] for c in session.calls] == ["HEAD"]
+
+
+@pytest.mark.parametrize(
+    "etag, head",
+    [
+        ('"v1"', (200, b"", {"Content-Length": str(len(BODY)), "ETag": '"v2"'})),  # changed ETag
+        ('"v1"', (200, b"", {"Content-Length": str(len(BODY) + 1), "ETag": '"v1"'})),  # changed size
+        (None, (200, b"", {"Content-Length": str(len(BODY)), "ETag": '"v2"'})),  # no sidecar
+        ('"v2"', (404, b"", {})),  # HEAD failed
+    ],
+)
+def test_download_to_refetches_stale_file(tmp_path, stub_session, etag, head):
+    out = _existing_download(tmp_path, etag=etag)
+    fresh = b"fresh archive bytes"
+    session = stub_session(head, (200, fresh, {"ETag": '"v2"'}))
+
+    assert _download_client(session).download_to(URL, out) == out
+    assert [c[0] for c in session.calls] == ["HEAD", "GET"]
+    assert session.calls[1][2]["headers"] == {"Accept-Encoding": "identity"}
+    assert out.read_bytes() == fresh
+    assert out.with_name(out.name + ".etag").read_text(encoding="utf-8") == '"v2"'
+
+
+def test_download_to_without_skip_existing_always_fetches(tmp_path, stub_session):
+    out = _existing_download(tmp_path, etag='"v1"')
+    session = stub_session((200, b"new", {}))
+
+    _download_client(session).download_to(URL, out, skip_existing=False)
+    assert [c[0] for c in session.calls] == ["GET"]
+    assert out.read_bytes() == b"new"
+    assert not out.with_name(out.name + ".etag").exists()
@@ -0,0 +1,17 @@
+from mgi.common import jsonio
+
+
+def test_jsonl_line_count_and_iteration(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"a": 1}\r\n\n  \n{"b": 2}')
+
+    assert jsonio.jsonl_line_count(path) == 4
+    assert [(n, jsonio.loads(line)) for n, line in jsonio.iter_jsonl_lines(path)] == [(1, {"a": 1}), (4, {"b": 2})]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+
+    assert jsonio.jsonl_line_count(path) == 0
+    assert list(jsonio.iter_jsonl_lines(path)) == []
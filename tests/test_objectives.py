@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mgi.common.time import to_epoch_ns
+from mgi.features.mistakes_untraded import nearest_objective_window
+from mgi.features.objectives import (
+    OBJECTIVE_EVENT_MARKERS,
+    OBJECTIVE_TYPE_MAP,
+    ObjectiveEvent,
+    has_objective_marker,
+    objective_answered_after,
+)
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _obj(seconds, team_id, kind="tower"):
+    at = T0 + timedelta(seconds=seconds)
+    return ObjectiveEvent(
+        occurred_at=at,
+        occurred_at_ns=to_epoch_ns(at),
+        kind=kind,
+        team_id=team_id,
+        player_name="",
+        raw_type="team-destroyed-tower",
+    )
+
+
+def test_answered_after_bisect_matches_linear_scan():
+    objectives = [_obj(s, t) for s, t in [(-5, "1"), (0, "2"), (10, "1"), (10, "2"), (90, "1"), (91, "2"), (200, "1")]]
+    objectives_ns = [o.occurred_at_ns for o in objectives]
+
+    for death_s in range(-10, 210, 5):
+        for team in ("1", "2", "3"):
+            death = T0 + timedelta(seconds=death_s)
+            expected = objective_answered_after(objectives, team, death, window_seconds=90)
+            got = objective_answered_after(objectives, team, death, window_seconds=90, objectives_ns=objectives_ns)
+            assert got is expected
+
+
+NEAREST = [_obj(s, t) for s, t in [(0, "1"), (100, "2"), (100, "1"), (200, "1")]]
+
+
+@pytest.mark.parametrize(
+    "death_s, expected",
+    [
+        (-90, (0, 90)),  # before the first objective, exactly on the window boundary
+        (-90.001, None),  # just outside it
+        (290, (3, -90)),  # after the last objective, on the boundary
+        (290.001, None),
+        (50, (0, -50)),  # equidistant: the earlier objective wins
+        (99, (1, 1)),  # first of the objectives sharing a timestamp
+        (101, (1, -1)),
+        (150, (1, -50)),
+        (151, (3, 49)),
+    ],
+)
+def test_nearest_objective_window_edges(death_s, expected):
+    death = T0 + timedelta(seconds=death_s)
+    objectives_ns = [o.occurred_at_ns for o in NEAREST]
+
+    got = nearest_objective_window(NEAREST, to_epoch_ns(death), 90, objectives_ns=objectives_ns)
+    assert got == (None if expected is None else (NEAREST[expected[0]], expected[1]))
+    # datetime callers and a derived key list give the same answer
+    assert nearest_objective_window(NEAREST, death, 90) == got
+
+
+def test_nearest_objective_window_without_objectives():
+    assert nearest_objective_window([], T0, 90) is None
+    assert nearest_objective_window([], to_epoch_ns(T0), 90, objectives_ns=[]) is None
+
+
+def test_every_objective_type_passes_the_marker_prefilter():
+    for ev_type in OBJECTIVE_TYPE_MAP:
+        assert any(m in ev_type.encode() for m in OBJECTIVE_EVENT_MARKERS), ev_type
+        assert has_objective_marker(b'{"events": [{"type": "%s"}]}' % ev_type.encode())
+    assert not has_objective_marker(b'{"events": [{"type": "player-killed-player"}]}')
+
+
+def test_nearest_objective_window_scans_unsorted_objectives_without_keys():
+    objectives = [_obj(200, "1"), _obj(10, "2")]
+    assert nearest_objective_window(objectives, T0 + timedelta(seconds=12), 90) == (objectives[1], -2)
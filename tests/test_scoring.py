@@ -0,0 +1,32 @@
+from itertools import product
+
+import numpy as np
+
+from mgi.features.mistakes_untraded import OBJ_KIND_WEIGHT, score_mgi, score_mgi_array
+
+
+def test_vectorized_score_matches_scalar():
+    rows = [
+        (gravity, answered, pressure, kind)
+        for gravity, answered, pressure, kind in product((25, 30, 35), (False, True), (False, True), (None, "baron", "plate", "unknown"))
+        if not (pressure and kind is None)  # pressure always comes with a nearest objective
+    ]
+    expected = [
+        score_mgi(
+            gravity=g,
+            answered_by_objective=a,
+            is_pressure=p,
+            is_context=k is not None,
+            nearest_obj={"kind": k} if k else None,
+        )
+        for g, a, p, k in rows
+    ]
+
+    got = score_mgi_array(
+        np.array([r[0] for r in rows], dtype=np.int32),
+        np.array([r[1] for r in rows]),
+        np.array([r[2] for r in rows]),
+        np.array([r[3] is not None for r in rows]),
+        np.array([OBJ_KIND_WEIGHT.get(r[3], 0) if r[3] else 0 for r in rows]),
+    )
+    assert got.tolist() == expected
@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+
+from mgi.common.time import from_epoch_ns, parse_dt, to_epoch_ns
+
+
+def test_parse_dt_z_suffix_is_utc():
+    for s in ["2024-06-15T22:45:00.123Z", "2024-06-15T22:45:00Z", "2024-06-15T22:45:00.123456Z"]:
+        got = parse_dt(s)
+        assert got.tzinfo is timezone.utc
+        assert got.utcoffset() == timedelta(0)
+        assert got == datetime.fromisoformat(s[:-1] + "+00:00")
+
+
+def test_parse_dt_converts_offsets_to_utc():
+    got = parse_dt("2024-06-15T23:45:00.100+01:00")
+    assert got.tzinfo is timezone.utc
+    assert got.isoformat() == "2024-06-15T22:45:00.100000+00:00"
+
+
+def test_epoch_ns_round_trip():
+    dt = parse_dt("2024-06-15T22:56:54.799Z")
+    ns = to_epoch_ns(dt)
+    assert ns == 1718492214799000000
+    assert from_epoch_ns(ns) == dt
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from mgi.features import _numba_kernels
+from mgi.features.mistakes_untraded import Kills, detect_untraded
+
+
+def _kills(rows):
+    """rows: (seconds, killer_team, victim_team) in file order."""
+    team_ids = sorted({r[1] for r in rows} | {r[2] for r in rows})
+    code = {t: i for i, t in enumerate(team_ids)}
+    return Kills(
+        occurred_at_ns=np.array([r[0] * 1_000_000_000 for r in rows], dtype=np.int64),
+        killer_player_ids=[f"k{i}" for i in range(len(rows))],
+        killer_names=[""] * len(rows),
+        killer_team_codes=np.array([code[r[1]] for r in rows], dtype=np.int32),
+        victim_player_ids=[f"v{i}" for i in range(len(rows))],
+        victim_names=[""] * len(rows),
+        victim_team_codes=np.array([code[r[2]] for r in rows], dtype=np.int32),
+        team_ids=team_ids,
+    )
+
+
+def test_trade_must_come_later_in_same_cluster():
+    kills = _kills([
+        (0, "A", "B"),    # B answers at t=10 -> traded
+        (10, "B", "A"),   # A never answers afterwards -> untraded
+        (100, "A", "B"),  # new cluster (gap 90s > 45s); B's earlier kill doesn't count -> untraded
+        (130, "A", "B"),  # same cluster as t=100, B never kills -> untraded
+    ])
+    assert detect_untraded(kills, fight_gap_seconds=45).tolist() == [1, 2, 3]
+
+
+def test_same_timestamp_uses_file_order():
+    kills = _kills([(5, "B", "A"), (5, "A", "B")])
+    assert detect_untraded(kills, fight_gap_seconds=45).tolist() == [1]
+
+
+def test_unsorted_input_returns_file_indices_in_time_order():
+    kills = _kills([(50, "A", "B"), (0, "A", "B"), (20, "A", "B")])
+    assert detect_untraded(kills, fight_gap_seconds=45).tolist() == [1, 2, 0]
+
+
+def _reference_mask(t, killer, victim, gap_ns):
+    """Direct statement of the rule: the victim team kills nobody later in the same fight cluster."""
+    out = []
+    for i in range(len(t)):
+        j = i + 1
+        answered = False
+        while j < len(t) and t[j] - t[j - 1] <= gap_ns:
+            answered = answered or killer[j] == victim[i]
+            j += 1
+        out.append(not answered)
+    return out
+
+
+@pytest.mark.parametrize("use_jit", [True, False])
+def test_untraded_mask_matches_reference(monkeypatch, use_jit):
+    if use_jit and _numba_kernels._untraded_mask_jit is None:
+        pytest.skip("numba not installed")
+    if not use_jit:
+        monkeypatch.setattr(_numba_kernels, "_untraded_mask_jit", None)
+
+    rng = np.random.default_rng(0)
+    t = np.sort(rng.integers(0, 3_000, size=500)).astype(np.int64) * 1_000_000_000
+    killer = rng.integers(0, 3, size=500).astype(np.int32)
+    victim = ((killer + rng.integers(1, 3, size=500)) % 3).astype(np.int32)
+    gap_ns = 45 * 1_000_000_000
+
+    expected = _reference_mask(t.tolist(), killer.tolist(), victim.tolist(), gap_ns)
+    assert _numba_kernels.untraded_mask(t, killer, victim, gap_ns).tolist() == expected
+
+
+@pytest.mark.parametrize("use_jit", [True, False])
+def test_untraded_mask_accepts_int64_codes(monkeypatch, use_jit):
+    if use_jit and _numba_kernels._untraded_mask_jit is None:
+        pytest.skip("numba not installed")
+    if not use_jit:
+        monkeypatch.setattr(_numba_kernels, "_untraded_mask_jit", None)
+
+    t = np.array([0, 10, 100, 130], dtype=np.int64) * 1_000_000_000
+    killer = np.array([0, 1, 0, 0], dtype=np.int64)
+    victim = np.array([1, 0, 1, 1], dtype=np.int64)
+    gap_ns = 45 * 1_000_000_000
+
+    expected = [False, True, True, True]
+    assert _numba_kernels.untraded_mask(t, killer, victim, gap_ns).tolist() == expected
+    assert _numba_kernels.untraded_mask(t.tolist(), killer.tolist(), victim.tolist(), gap_ns).tolist() == expected
@@ -1,22 +1,18 @@
 import json
-from pathlib import Path
+import shutil
 
-from mgi.features.mistakes_untraded import run
+from mgi.features.mistakes_untraded import run, run_many
 
-def test_untraded_snapshot(tmp_path, monkeypatch):
+def test_untraded_snapshot(tmp_path, monkeypatch, events_small_path, expected_untraded):
     # Arrange: copy fixture into temp data folder
     root = tmp_path
     (root / "data" / "raw" / "series_1").mkdir(parents=True)
     (root / "data" / "derived" / "series_1").mkdir(parents=True)
 
-    fixture = Path("tests/fixtures/events_small.jsonl").read_text(encoding="utf-8")
-    (root / "data" / "raw" / "series_1" / "events.jsonl").write_text(fixture, encoding="utf-8")
+    shutil.copyfile(events_small_path, root / "data" / "raw" / "series_1" / "events.jsonl")
 
     # optional end_state.json if you want team names
-    (root / "data" / "raw" / "series_1" / "end_state.json").write_text("{}", encoding="utf-8")
-
-    # Get original project root before monkeypatch.chdir
-    orig_root = Path.cwd()
+    (root / "data" / "raw" / "series_1" / "end_state.json").write_bytes(b"{}")
 
     monkeypatch.chdir(root)
 
@@ -25,7 +21,7 @@ def test_untraded_snapshot(tmp_path, monkeypatch):
     assert rc == 0
 
     got = json.loads((root / "data" / "derived" / "series_1" / "mistakes_untraded.json").read_text(encoding="utf-8"))
-    expected = json.loads((orig_root / "tests/expected/mistakes_untraded_expected.json").read_text(encoding="utf-8"))
+    expected = expected_untraded
 
     # Assert
     assert got == expected
@@ -33,3 +29,56 @@ def test_untraded_snapshot(tmp_path, monkeypatch):
     # Invariants
     assert sum(x["isNearObjective"] for x in got) >= sum(x["isPressureObjective"] for x in got)
     assert sum(x["answeredByObjective"] for x in got) <= len(got)
+
+
+def test_run_many_matches_sequential_runs(tmp_path, monkeypatch, events_small_path):
+    lines = events_small_path.read_bytes().splitlines(keepends=True)
+    for series_id, data in (("1", b"".join(lines)), ("2", b"".join(lines[: len(lines) // 2]))):
+        raw = tmp_path / "data" / "raw" / f"series_{series_id}"
+        raw.mkdir(parents=True)
+        (raw / "events.jsonl").write_bytes(data)
+        (raw / "end_state.json").write_bytes(b"{}")
+    monkeypatch.chdir(tmp_path)
+
+    def outputs():
+        return {s: (tmp_path / "data" / "derived" / f"series_{s}" / "mistakes_untraded.json").read_bytes() for s in ("1", "2")}
+
+    assert [run(s, top=5, window_seconds=25, quiet=True) for s in ("1", "2")] == [0, 0]
+    sequential = outputs()
+    shutil.rmtree(tmp_path / "data" / "derived")
+
+    # Series 3 has no downloaded files; it fails on its own without dropping the others
+    codes = run_many(["1", "3", "2"], top=5, window_seconds=25, workers=2)
+    assert codes == {"1": 0, "3": 1, "2": 0}
+    assert list(codes) == ["1", "3", "2"]
+    assert outputs() == sequential
+
+
+def test_report_tables_print_as_tsv_when_piped(tmp_path, monkeypatch, capsys, events_small_path, expected_untraded):
+    raw = tmp_path / "data" / "raw" / "series_1"
+    raw.mkdir(parents=True)
+    shutil.copyfile(events_small_path, raw / "events.jsonl")
+    (raw / "end_state.json").write_bytes(b"{}")
+    monkeypatch.chdir(tmp_path)
+    for var in ("FORCE_COLOR", "TTY_COMPATIBLE", "TTY_INTERACTIVE"):
+        monkeypatch.delenv(var, raising=False)
+
+    assert run("1", top=5, window_seconds=25) == 0
+    lines = capsys.readouterr().out.splitlines()
+
+    start = lines.index("Top 5 Mistakes by Mistake Gravity Index (MGI)")
+    header = lines[start + 1].split("\t")
+    assert header == [
+        "Occurred At", "Team", "Victim", "Gravity (MVP)", "MGI Score",
+        "Obj Answer (+Δt)", "Objective Proximity", "Details",
+    ]
+    rows = [line.split("\t") for line in lines[start + 2 : start + 2 + len(expected_untraded)]]
+    assert all(len(row) == len(header) for row in rows)
+    by_score = sorted(expected_untraded, key=lambda x: (x["mgiScore"], x["occurredAt"]), reverse=True)
+    assert [(r[2], int(r[4])) for r in rows] == [(x["victimName"], x["mgiScore"]) for x in by_score]
+    assert not any("[bold" in cell for row in rows for cell in row)
+
+    assert lines[start + 2 + len(expected_untraded)] == "Team Summary (Victim Team)"
+    assert lines.index("Player Summary (Victims)") > start
+    assert lines.index("MGI Score Distribution") > start
+    assert "─" not in "\n".join(lines)  # no Rich box drawing